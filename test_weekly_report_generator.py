@@ -0,0 +1,157 @@
+"""Tests for CSV loading and missing values in generated Excel reports"""
+
+import os
+from datetime import datetime, timedelta
+
+import openpyxl
+import pandas as pd
+import pytest
+
+import weekly_report_generator as wrg
+
+
+@pytest.fixture(params=['xlsxwriter', 'openpyxl'])
+def generator(request, tmp_path, monkeypatch):
+    """Report generator without caching, writing through the requested engine"""
+    if request.param == 'xlsxwriter' and wrg.xlsxwriter is None:
+        pytest.skip("xlsxwriter is not installed")
+    if request.param == 'openpyxl':
+        monkeypatch.setattr(wrg, 'xlsxwriter', None)
+    monkeypatch.chdir(tmp_path)
+    gen = wrg.WeeklyReportGenerator(str(tmp_path / 'missing_config.json'))
+    gen.config['cache_dir'] = ''
+    return gen
+
+
+def write_csv(path, days_ago, products):
+    """Write a CSV with one row per product, dated the given number of days ago"""
+    date = (datetime.now() - timedelta(days=days_ago)).strftime('%Y-%m-%d')
+    pd.DataFrame({
+        'Date': [date] * len(products),
+        'Product': products,
+        'Sales': range(1, len(products) + 1),
+        'Units': range(10, 10 + len(products)),
+        'Revenue': [100.5 * (i + 1) for i in range(len(products))],
+        'Region': ['North'] * len(products),
+    }).to_csv(path, index=False)
+
+
+def column_values(sheet, col_idx):
+    """Return the values of one column below the header row"""
+    return [row[0] for row in sheet.iter_rows(min_row=2, min_col=col_idx, max_col=col_idx, values_only=True)]
+
+
+def test_report_for_empty_week(generator, tmp_path):
+    csv_path = tmp_path / 'old.csv'
+    write_csv(csv_path, days_ago=30, products=['Product A', 'Product B'])
+
+    assert generator.load_raw_data(str(csv_path))
+    assert generator.clean_data()
+    assert len(generator.cleaned_data) == 0
+    assert generator.create_excel_report(str(tmp_path / 'report.xlsx'))
+
+    summary = openpyxl.load_workbook(tmp_path / 'report.xlsx')['Summary']
+    values = {row[0]: row[1] for row in summary.iter_rows(min_row=5, values_only=True)}
+    assert values['Total Records'] == 0
+    assert values['Avg Revenue'] is None
+    assert values['Max Sales'] is None
+
+
+def test_report_with_blank_label(generator, tmp_path):
+    csv_path = tmp_path / 'blank.csv'
+    write_csv(csv_path, days_ago=1, products=['Product A', None, 'Product B'])
+
+    assert generator.load_raw_data(str(csv_path))
+    assert generator.clean_data()
+    assert generator.create_excel_report(str(tmp_path / 'report.xlsx'))
+
+    data = openpyxl.load_workbook(tmp_path / 'report.xlsx')['Raw Data']
+    assert column_values(data, 2) == ['Product A', None, 'Product B']
+    assert column_values(data, 5) == [100.5, 201.0, 301.5]
+    assert data.cell(row=3, column=5).number_format == wrg.REVENUE_FMT
+
+
+def test_report_drops_unparseable_revenue(generator, tmp_path):
+    csv_path = tmp_path / 'dirty.csv'
+    write_csv(csv_path, days_ago=1, products=['Product A', 'Product B', 'Product C'])
+    df = pd.read_csv(csv_path)
+    df['Revenue'] = ['$1,234.50', '-', 'bad']
+    df.to_csv(csv_path, index=False)
+
+    assert generator.load_raw_data(str(csv_path))
+    assert generator.clean_data()
+    assert list(generator.cleaned_data['Product']) == ['Product A']
+    assert generator.generate_summary_stats()['Total_Revenue'] == 1234.5
+    assert generator.create_excel_report(str(tmp_path / 'report.xlsx'))
+
+    data = openpyxl.load_workbook(tmp_path / 'report.xlsx')['Raw Data']
+    assert column_values(data, 5) == [1234.5]
+
+
+def test_unreadable_cache_is_rebuilt(generator, tmp_path):
+    if wrg.pyarrow is None:
+        pytest.skip("pyarrow is not installed")
+    csv_path = tmp_path / 'cached.csv'
+    write_csv(csv_path, days_ago=1, products=['Product A', 'Product B'])
+    generator.config['cache_dir'] = str(tmp_path / 'cache')
+    cache_path = generator._cache_file(str(csv_path))
+    (tmp_path / 'cache').mkdir()
+    with open(cache_path, 'wb') as f:
+        f.write(b'not parquet')
+
+    assert generator.load_raw_data(str(csv_path))
+    assert generator.data is not None
+    assert generator.clean_data()
+    assert len(generator.cleaned_data) == 2
+    assert os.listdir(tmp_path / 'cache') == [os.path.basename(cache_path)]
+
+    assert generator.load_raw_data(str(csv_path))
+    assert generator.data is None
+    assert generator.clean_data()
+    assert len(generator.cleaned_data) == 2
+
+
+def test_load_day_first_dates(generator, tmp_path):
+    csv_path = tmp_path / 'day_first.csv'
+    csv_path.write_text('Date,Product,Sales,Units,Revenue,Region\n09/10/2026,A,1,2,3.5,North\n')
+    generator.config['date_format'] = '%d/%m/%Y'
+
+    assert generator.load_raw_data(str(csv_path))
+    assert generator.data['Date'].iloc[0] == pd.Timestamp(2026, 10, 9)
+
+
+def test_date_column_fits_datetime_format(generator, tmp_path):
+    csv_path = tmp_path / 'dates.csv'
+    write_csv(csv_path, days_ago=1, products=['A'])
+
+    assert generator.load_raw_data(str(csv_path))
+    assert generator.clean_data()
+    assert generator.create_excel_report(str(tmp_path / 'report.xlsx'))
+
+    data = openpyxl.load_workbook(tmp_path / 'report.xlsx')['Raw Data']
+    assert data.column_dimensions['A'].width >= len('2026-10-14 00:00:00')
+
+
+def write_encoded_csv(path, products, encoding):
+    """Write a CSV with one row per product in the given encoding"""
+    lines = ['Date,Product,Sales,Units,Revenue,Region']
+    lines += [f"2026-10-14,{product},1,2,3.5,North" for product in products]
+    path.write_bytes('\n'.join(lines).encode(encoding))
+
+
+def test_load_non_utf8_bytes_after_sampled_head(generator, tmp_path):
+    csv_path = tmp_path / 'late_latin1.csv'
+    write_encoded_csv(csv_path, ['Product A'] * 2500 + ['Café'], 'latin-1')
+    assert csv_path.stat().st_size > 65536
+
+    assert generator.load_raw_data(str(csv_path))
+    assert generator.data['Product'].iloc[0] == 'Product A'
+    assert generator.data['Product'].iloc[-1] == 'Café'
+
+
+def test_load_short_cp1252_file(generator, tmp_path):
+    csv_path = tmp_path / 'cp1252.csv'
+    write_encoded_csv(csv_path, ['São', 'ação'], 'cp1252')
+
+    assert generator.load_raw_data(str(csv_path))
+    assert list(generator.data['Product']) == ['São', 'ação']
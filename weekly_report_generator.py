@@ -5,23 +5,78 @@ Processes raw data and generates formatted Excel reports
 """
 
 import pandas as pd
+import numpy as np
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
-from openpyxl.utils.dataframe import dataframe_to_rows
+from openpyxl.utils import get_column_letter
 from openpyxl.chart import BarChart, Reference
 import os
+import codecs
+import hashlib
 from datetime import datetime, timedelta
 import logging
+from logging.handlers import QueueHandler, QueueListener
+import queue
+import atexit
 
-# Configure logging
+try:
+    import xlsxwriter
+except ImportError:  # optional: faster constant-memory writer
+    xlsxwriter = None
+
+try:
+    import pyarrow
+except ImportError:  # optional: Arrow-backed DataFrame columns
+    pyarrow = None
+
+try:
+    import charset_normalizer
+except ImportError:  # optional: single-pass encoding detection
+    charset_normalizer = None
+
+# Configure logging; records are queued and written by a background thread
+LOG_LEVEL = (os.environ.get('WEEKLY_REPORT_LOG_LEVEL') or 'WARNING').upper()
+_unknown_log_level = None
+if not isinstance(logging.getLevelName(LOG_LEVEL), int):  # not a registered level name
+    _unknown_log_level, LOG_LEVEL = LOG_LEVEL, 'WARNING'
+_log_queue = queue.Queue(-1)
+_log_listener = QueueListener(
+    _log_queue,
+    logging.FileHandler('weekly_report.log'),
+    logging.StreamHandler(),
+    respect_handler_level=True
+)
 logging.basicConfig(
-    level=logging.INFO,
+    level=LOG_LEVEL,
     format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('weekly_report.log'),
-        logging.StreamHandler()
-    ]
+    handlers=[QueueHandler(_log_queue)]
 )
+_log_listener.start()
+atexit.register(_log_listener.stop)
+if _unknown_log_level is not None:
+    logging.warning(f"Unknown WEEKLY_REPORT_LOG_LEVEL '{_unknown_log_level}'. Using WARNING.")
+
+# Shared styles, created once and attached to every write-only cell that needs them
+TITLE_FONT = Font(size=16, bold=True)
+CHART_TITLE_FONT = Font(size=14, bold=True)
+BOLD_FONT = Font(bold=True)
+BOLD_WHITE = Font(color="FFFFFF", bold=True)
+HEADER_FILL = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+SUMMARY_FILL = PatternFill(start_color="E6E6FA", end_color="E6E6FA", fill_type="solid")
+REVENUE_FMT = '$#,##0.00'
+NUMBER_FMT = '#,##0'
+
+# Fixed labels on the summary sheet
+SUMMARY_TITLE = "Weekly Report Summary"
+GENERATED_LABEL = "Report Generated:"
+
+# Low-cardinality text columns stored as pandas categories
+CATEGORICAL_COLUMNS = ['Product', 'Region']
+
+# Currency symbols and thousands separators stripped from numeric text
+# (a pattern string, since Arrow-backed strings do not accept compiled patterns)
+CURRENCY_PATTERN = r'[$,]'
 
 class WeeklyReportGenerator:
     def __init__(self, config_file='config.json'):
@@ -29,6 +84,8 @@ class WeeklyReportGenerator:
         self.config = self.load_config(config_file)
         self.data = None
         self.cleaned_data = None
+        self._cache_path = None
+        self._cache_hit = False
         
     def load_config(self, config_file):
         """Load configuration settings"""
@@ -39,7 +96,10 @@ class WeeklyReportGenerator:
             'template_file': 'report_template.xlsx',
             'data_columns': ['Date', 'Product', 'Sales', 'Units', 'Revenue', 'Region'],
             'date_column': 'Date',
-            'numeric_columns': ['Sales', 'Units', 'Revenue']
+            'date_format': '%Y-%m-%d',
+            'numeric_columns': ['Sales', 'Units', 'Revenue'],
+            'cache_dir': '.wr_cache',
+            'cache_max_files': 8
         }
         
         # Try to load from file if it exists
@@ -59,14 +119,39 @@ class WeeklyReportGenerator:
         if file_path is None:
             file_path = self.config['input_file']
         
+        # Forget the previous file so a failed load cannot leave stale data behind
+        self.data = None
+        self._cache_path = None
+        self._cache_hit = False
+        
         try:
             logging.info(f"Loading raw data from {file_path}")
             
-            # Try different encodings
-            encodings = ['utf-8', 'latin-1', 'cp1252']
-            for encoding in encodings:
+            # Reuse the cleaned data from an earlier run on the same file
+            self._cache_path = self._cache_file(file_path)
+            if self._cache_path is not None and os.path.exists(self._cache_path):
+                try:
+                    self.cleaned_data = pd.read_parquet(self._cache_path)
+                    os.utime(self._cache_path)  # mark as recently used
+                    self._cache_hit = True
+                    logging.info(f"Loaded {len(self.cleaned_data)} cleaned rows from cache {self._cache_path}")
+                    return True
+                except Exception as e:
+                    # Drop the broken entry and rebuild it from the CSV
+                    logging.warning(f"Ignoring unreadable cache {self._cache_path}: {e}")
+                    self.cleaned_data = None
+                    try:
+                        os.remove(self._cache_path)
+                    except OSError:
+                        pass
+            
+            # Try the encodings that fit the file head; the C parser raises on bytes
+            # it cannot decode anywhere in the file, which moves on to the next one
+            for encoding in self._candidate_encodings(file_path):
                 try:
-                    self.data = pd.read_csv(file_path, encoding=encoding)
+                    self.data = pd.read_csv(
+                        file_path, encoding=encoding, engine='c', **self._read_options(file_path, encoding)
+                    )
                     logging.info(f"Successfully loaded data with {encoding} encoding")
                     break
                 except UnicodeDecodeError:
@@ -82,46 +167,156 @@ class WeeklyReportGenerator:
             logging.error(f"Error loading raw data: {e}")
             return False
     
-    def clean_data(self):
-        """Clean and process the raw data"""
+    def _cache_file(self, file_path):
+        """Return the cache path for the cleaned form of file_path, or None if caching is off"""
+        cache_dir = self.config.get('cache_dir')
+        if not cache_dir or pyarrow is None:
+            return None
+        
+        # Cleaning depends on the file contents, the column settings and the current week
+        st = os.stat(file_path)
+        settings = [self.config[name] for name in ('data_columns', 'date_column', 'date_format', 'numeric_columns')]
+        fingerprint = f"{os.path.abspath(file_path)}:{st.st_size}:{st.st_mtime_ns}:{datetime.now().date()}:{settings}"
+        key = hashlib.sha1(fingerprint.encode()).hexdigest()[:16]
+        return os.path.join(cache_dir, f"{key}.parquet")
+    
+    def _save_cache(self):
+        """Store the cleaned data for later runs and drop the least recently used entries"""
+        cache_dir = os.path.dirname(self._cache_path)
+        os.makedirs(cache_dir, exist_ok=True)
+        
+        # Write under a temporary name so an interrupted run never leaves a truncated entry
+        tmp_path = f"{self._cache_path}.{os.getpid()}.tmp"
+        try:
+            self.cleaned_data.to_parquet(tmp_path, compression='zstd')
+            os.replace(tmp_path, self._cache_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        
+        entries = sorted(
+            (os.path.join(cache_dir, name) for name in os.listdir(cache_dir) if name.endswith('.parquet')),
+            key=os.path.getmtime,
+            reverse=True
+        )
+        for stale in entries[self.config['cache_max_files']:]:
+            os.remove(stale)
+    
+    def _candidate_encodings(self, file_path):
+        """Return the encodings to try, in order, judged from the first 64 KB of the file"""
+        with open(file_path, 'rb') as f:
+            head = f.read(65536)
+        
+        # A UTF-8 head (including plain ASCII) only rules UTF-8 in; later bytes may still
+        # be Western, so keep the encodings this loader has always supported behind it.
+        # The head may end mid-character, hence the incremental decoder.
         try:
+            codecs.getincrementaldecoder('utf-8')().decode(head)
+            return ['utf-8', 'cp1252', 'latin-1']
+        except UnicodeDecodeError:
+            pass
+        
+        try:
+            head.decode('cp1252')
+            return ['cp1252', 'latin-1']
+        except UnicodeDecodeError:
+            pass
+        
+        # Bytes undefined in cp1252 suggest a non-Western encoding; latin-1 decodes anything
+        encodings = ['latin-1']
+        if charset_normalizer is not None:
+            best = charset_normalizer.from_bytes(head).best()
+            if best is not None:
+                encodings.insert(0, codecs.lookup(best.encoding).name)
+                logging.info(f"Detected {encodings[0]} encoding")
+        return encodings
+    
+    def _read_options(self, file_path, encoding):
+        """Build read_csv options that restrict parsing to the configured columns"""
+        options = {}
+        if pyarrow is not None:
+            # Arrow-backed columns are smaller and aggregate in C++ kernels
+            options['dtype_backend'] = 'pyarrow'
+        
+        header = pd.read_csv(file_path, encoding=encoding, nrows=0).columns
+        date_col = self.config['date_column']
+        wanted = self.config['data_columns'] + [date_col] + self.config['numeric_columns']
+        usecols = [col for col in dict.fromkeys(wanted) if col in header]
+        if not usecols:
+            return options
+        
+        options['usecols'] = usecols
+        options['dtype'] = {col: 'category' for col in CATEGORICAL_COLUMNS if col in usecols}
+        if date_col in usecols:
+            # Values that do not match date_format stay text and are coerced by clean_data
+            options['parse_dates'] = [date_col]
+            options['date_format'] = self.config['date_format']
+        return options
+    
+    def clean_data(self, preserve_raw=False):
+        """Clean and process the raw data (modifies self.data unless preserve_raw is True)"""
+        try:
+            if self._cache_hit:
+                logging.info("Using cached cleaned data")
+                return True
+            
             logging.info("Starting data cleaning process")
-            self.cleaned_data = self.data.copy()
+            date_col = self.config['date_column']
+            num_cols = self.config['numeric_columns']
+            now = datetime.now()
+            # Transform the loaded frame directly to avoid holding two copies in memory
+            df = self.data.copy() if preserve_raw else self.data
+            
+            # Convert date column to NumPy datetime unless it was parsed while reading
+            if date_col in df.columns and not pd.api.types.is_datetime64_dtype(df[date_col]):
+                df[date_col] = pd.to_datetime(
+                    df[date_col], format=self.config['date_format'], errors='coerce', cache=True
+                )
             
-            # Convert date column to datetime
-            if self.config['date_column'] in self.cleaned_data.columns:
-                self.cleaned_data[self.config['date_column']] = pd.to_datetime(
-                    self.cleaned_data[self.config['date_column']], 
-                    errors='coerce'
+            # Clean numeric columns that were not already parsed as numbers
+            text_cols = [
+                col for col in num_cols
+                if col in df.columns and not pd.api.types.is_numeric_dtype(df[col])
+            ]
+            if text_cols:
+                # Remove currency symbols and commas, then convert to numeric. Arrow
+                # counts NaN as a value, so unparseable text must become NA instead
+                backend = {'dtype_backend': 'pyarrow'} if pyarrow is not None else {}
+                df[text_cols] = (
+                    df[text_cols]
+                    .replace(CURRENCY_PATTERN, '', regex=True)
+                    .apply(pd.to_numeric, errors='coerce', **backend)
                 )
             
-            # Clean numeric columns
-            for col in self.config['numeric_columns']:
-                if col in self.cleaned_data.columns:
-                    # Remove currency symbols and commas
-                    self.cleaned_data[col] = self.cleaned_data[col].astype(str).str.replace(r'[$,]', '', regex=True)
-                    # Convert to numeric
-                    self.cleaned_data[col] = pd.to_numeric(self.cleaned_data[col], errors='coerce')
-            
-            # Remove rows with missing critical data
-            critical_columns = [self.config['date_column']] + self.config['numeric_columns']
-            initial_rows = len(self.cleaned_data)
-            self.cleaned_data = self.cleaned_data.dropna(subset=critical_columns)
-            final_rows = len(self.cleaned_data)
-            
-            logging.info(f"Removed {initial_rows - final_rows} rows with missing data")
-            
-            # Filter for current week's data
-            end_date = datetime.now()
+            # Store repeated labels as categories so grouping works on integer codes
+            for col in CATEGORICAL_COLUMNS:
+                if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+                    df[col] = df[col].astype('category')
+            
+            # Flag rows with missing critical data
+            critical_columns = [date_col] + num_cols
+            mask = df[critical_columns].notna().to_numpy().all(axis=1)
+            
+            logging.info(f"Removed {int((~mask).sum())} rows with missing data")
+            
+            # Flag rows outside the current week
+            end_date = now
             start_date = end_date - timedelta(days=7)
             
-            if self.config['date_column'] in self.cleaned_data.columns:
-                self.cleaned_data = self.cleaned_data[
-                    (self.cleaned_data[self.config['date_column']] >= start_date) &
-                    (self.cleaned_data[self.config['date_column']] <= end_date)
-                ]
+            if date_col in df.columns:
+                dates = df[date_col].to_numpy()
+                mask &= (dates >= np.datetime64(start_date)) & (dates <= np.datetime64(end_date))
+            
+            # Apply both filters in a single selection
+            self.cleaned_data = df.iloc[mask]
             
             logging.info(f"Data cleaning completed. Final dataset: {len(self.cleaned_data)} rows")
+            
+            if self._cache_path is not None:
+                try:
+                    self._save_cache()
+                except Exception as e:
+                    logging.warning(f"Could not cache cleaned data: {e}")
             return True
             
         except Exception as e:
@@ -131,29 +326,30 @@ class WeeklyReportGenerator:
     def generate_summary_stats(self):
         """Generate summary statistics"""
         try:
+            df = self.cleaned_data
+            columns = df.columns
+            now = datetime.now()
             summary = {}
             
             for col in self.config['numeric_columns']:
-                if col in self.cleaned_data.columns:
-                    summary[f'Total_{col}'] = self.cleaned_data[col].sum()
-                    summary[f'Avg_{col}'] = self.cleaned_data[col].mean()
-                    summary[f'Max_{col}'] = self.cleaned_data[col].max()
-                    summary[f'Min_{col}'] = self.cleaned_data[col].min()
+                if col in columns:
+                    values = df[col]
+                    summary[f'Total_{col}'] = values.sum()
+                    summary[f'Avg_{col}'] = values.mean()
+                    summary[f'Max_{col}'] = values.max()
+                    summary[f'Min_{col}'] = values.min()
             
             # Additional metrics
-            summary['Total_Records'] = len(self.cleaned_data)
-            summary['Report_Date'] = datetime.now().strftime("%Y-%m-%d")
+            summary['Total_Records'] = len(df)
+            summary['Report_Date'] = now.strftime("%Y-%m-%d")
             
             # Group by categorical columns for insights
-            if 'Product' in self.cleaned_data.columns and 'Revenue' in self.cleaned_data.columns:
-                top_products = self.cleaned_data.groupby('Product')['Revenue'].sum().sort_values(ascending=False)
-                summary['Top_Product'] = top_products.index[0] if len(top_products) > 0 else 'N/A'
-                summary['Top_Product_Revenue'] = top_products.iloc[0] if len(top_products) > 0 else 0
-            
-            if 'Region' in self.cleaned_data.columns and 'Revenue' in self.cleaned_data.columns:
-                top_regions = self.cleaned_data.groupby('Region')['Revenue'].sum().sort_values(ascending=False)
-                summary['Top_Region'] = top_regions.index[0] if len(top_regions) > 0 else 'N/A'
-                summary['Top_Region_Revenue'] = top_regions.iloc[0] if len(top_regions) > 0 else 0
+            if 'Revenue' in columns:
+                if 'Product' in columns:
+                    summary['Top_Product'], summary['Top_Product_Revenue'] = self._top_group('Product', 'Revenue')
+                
+                if 'Region' in columns:
+                    summary['Top_Region'], summary['Top_Region_Revenue'] = self._top_group('Region', 'Revenue')
             
             return summary
             
@@ -161,6 +357,30 @@ class WeeklyReportGenerator:
             logging.error(f"Error generating summary stats: {e}")
             return {}
     
+    def _top_group(self, key, val):
+        """Return the key with the largest summed value and that sum"""
+        column = self.cleaned_data[key]
+        vals = self.cleaned_data[val].to_numpy()
+        categorical = isinstance(column.dtype, pd.CategoricalDtype)
+        if categorical:
+            # Group on the integer category codes; -1 marks a missing label
+            keys = column.cat.codes.to_numpy()
+            valid = keys >= 0
+        else:
+            keys = column.to_numpy()
+            valid = pd.notna(keys)
+        if not valid.any():
+            return 'N/A', 0
+        keys, vals = keys[valid], vals[valid]
+        
+        # Sort once so each group is a contiguous run, then sum the runs
+        order = keys.argsort(kind='stable')
+        uniq, starts = np.unique(keys[order], return_index=True)
+        sums = np.add.reduceat(vals[order], starts)
+        i = sums.argmax()
+        top = column.cat.categories[uniq[i]] if categorical else uniq[i]
+        return top, sums[i]
+    
     def create_excel_report(self, output_file=None):
         """Create formatted Excel report"""
         if output_file is None:
@@ -169,30 +389,11 @@ class WeeklyReportGenerator:
         try:
             logging.info(f"Creating Excel report: {output_file}")
             
-            # Create workbook
-            wb = openpyxl.Workbook()
-            
-            # Remove default sheet
-            if 'Sheet' in wb.sheetnames:
-                wb.remove(wb['Sheet'])
+            if xlsxwriter is not None:
+                self._write_report_xlsxwriter(output_file)
+            else:
+                self._write_report_openpyxl(output_file)
             
-            # Create Summary sheet
-            summary_sheet = wb.create_sheet("Summary")
-            self._create_summary_sheet(summary_sheet)
-            
-            # Create Data sheet
-            data_sheet = wb.create_sheet("Raw Data")
-            self._create_data_sheet(data_sheet)
-            
-            # Create Charts sheet
-            charts_sheet = wb.create_sheet("Charts")
-            self._create_charts_sheet(charts_sheet)
-            
-            # Set Summary as active sheet
-            wb.active = summary_sheet
-            
-            # Save workbook
-            wb.save(output_file)
             logging.info(f"Excel report saved successfully: {output_file}")
             return True
             
@@ -200,98 +401,229 @@ class WeeklyReportGenerator:
             logging.error(f"Error creating Excel report: {e}")
             return False
     
+    def _write_report_openpyxl(self, output_file):
+        """Write the report with an openpyxl write-only workbook"""
+        # Create write-only workbook (starts without a default sheet)
+        wb = openpyxl.Workbook(write_only=True)
+        
+        # Create Summary sheet (first sheet, so it opens as the active one)
+        summary_sheet = wb.create_sheet("Summary")
+        self._create_summary_sheet(summary_sheet)
+        
+        # Create Data sheet
+        data_sheet = wb.create_sheet("Raw Data")
+        self._create_data_sheet(data_sheet)
+        
+        # Create Charts sheet
+        charts_sheet = wb.create_sheet("Charts")
+        self._create_charts_sheet(charts_sheet)
+        
+        # Save workbook
+        wb.save(output_file)
+    
+    def _write_report_xlsxwriter(self, output_file):
+        """Write the report with xlsxwriter, flushing each row to disk as it is written"""
+        wb = xlsxwriter.Workbook(output_file, {
+            'constant_memory': True,
+            'strings_to_numbers': False,
+            'nan_inf_to_errors': True,
+            'default_date_format': 'yyyy-mm-dd h:mm:ss',
+        })
+        
+        # Create every format once, up front
+        title_fmt = wb.add_format({'bold': True, 'font_size': 16})
+        chart_title_fmt = wb.add_format({'bold': True, 'font_size': 14})
+        label_fmt = wb.add_format({'bold': True, 'bg_color': '#E6E6FA', 'pattern': 1})
+        header_fmt = wb.add_format({'bold': True, 'font_color': '#FFFFFF', 'bg_color': '#4472C4', 'pattern': 1})
+        num_fmts = {fmt: wb.add_format({'num_format': fmt}) for fmt in (REVENUE_FMT, NUMBER_FMT)}
+        
+        # Summary sheet
+        sheet = wb.add_worksheet("Summary")
+        rows = self._summary_rows()
+        generated_at = datetime.now().strftime("%Y-%m-%d %H:%M")
+        for col_idx, width in enumerate(self._column_widths(self._summary_lengths(rows, generated_at), 50)):
+            sheet.set_column(col_idx, col_idx, width)
+        sheet.merge_range(0, 0, 0, 3, SUMMARY_TITLE, title_fmt)
+        sheet.write_row(2, 0, (GENERATED_LABEL, generated_at))
+        for row_idx, (label, value, fmt) in enumerate(rows, 4):
+            sheet.write(row_idx, 0, label, label_fmt)
+            sheet.write(row_idx, 1, value, num_fmts.get(fmt))
+        
+        # Data sheet; numeric formats are column formats so rows need no per-cell format
+        sheet = wb.add_worksheet("Raw Data")
+        headers = list(self.cleaned_data.columns)
+        widths = self._column_widths(self._data_lengths(), 30)
+        for col_idx, (width, fmt) in enumerate(zip(widths, self._column_formats(headers))):
+            sheet.set_column(col_idx, col_idx, width, num_fmts.get(fmt))
+        sheet.write_row(0, 0, headers, header_fmt)
+        for row_idx, row_data in enumerate(self._data_rows(), 1):
+            sheet.write_row(row_idx, 0, row_data)
+        
+        # Charts sheet
+        sheet = wb.add_worksheet("Charts")
+        sheet.write(0, 0, "Data Visualizations", chart_title_fmt)
+        if 'Product' in self.cleaned_data.columns and 'Revenue' in self.cleaned_data.columns:
+            product_data = self._top_products()
+            sheet.write_row(2, 0, ("Product", "Revenue"))
+            rows = product_data.reset_index().itertuples(index=False, name=None)
+            for row_idx, row_data in enumerate(rows, 3):
+                sheet.write_row(row_idx, 0, row_data)
+            
+            last_row = 2 + len(product_data)
+            chart = wb.add_chart({'type': 'column'})
+            chart.add_series({
+                'name': ["Charts", 2, 1],
+                'categories': ["Charts", 3, 0, last_row, 0],
+                'values': ["Charts", 3, 1, last_row, 1],
+            })
+            chart.set_title({'name': "Top Products by Revenue"})
+            chart.set_x_axis({'name': "Products"})
+            chart.set_y_axis({'name': "Revenue"})
+            sheet.insert_chart("D3", chart)
+        
+        wb.close()
+    
+    def _styled_cell(self, sheet, value, font=None, fill=None, number_format=None):
+        """Build a write-only cell carrying the given shared styles"""
+        cell = WriteOnlyCell(sheet, value=value)
+        if font is not None:
+            cell.font = font
+        if fill is not None:
+            cell.fill = fill
+        if number_format is not None:
+            cell.number_format = number_format
+        return cell
+    
+    def _column_formats(self, headers):
+        """Return the number format for each column, or None if it is not numeric"""
+        numeric_columns = set(self.config['numeric_columns'])
+        return [
+            (REVENUE_FMT if 'Revenue' in header else NUMBER_FMT) if header in numeric_columns else None
+            for header in headers
+        ]
+    
+    def _column_widths(self, lengths, max_width):
+        """Convert each column's longest value length into a capped column width"""
+        return [min(int(length) + 2, max_width) for length in lengths]
+    
+    def _set_column_widths(self, sheet, lengths, max_width):
+        """Size each column to its longest value, capped at max_width"""
+        for col_idx, width in enumerate(self._column_widths(lengths, max_width), 1):
+            sheet.column_dimensions[get_column_letter(col_idx)].width = width
+    
+    def _summary_rows(self):
+        """Return the summary statistics as (label, value, number_format) rows"""
+        rows = []
+        for key, value in self.generate_summary_stats().items():
+            if pd.isna(value):
+                value = None  # e.g. Avg/Max/Min of an empty week; written as a blank cell
+            fmt = REVENUE_FMT if isinstance(value, (int, float)) and 'Revenue' in key else None
+            rows.append((key.replace('_', ' ').title(), value, fmt))
+        return rows
+    
+    def _summary_lengths(self, rows, generated_at):
+        """Return the longest label and value lengths on the summary sheet"""
+        label_lengths = [len(SUMMARY_TITLE), len(GENERATED_LABEL)] + [len(label) for label, _, _ in rows]
+        value_lengths = [len(generated_at)] + [len(str(value)) for _, value, _ in rows]
+        return [max(label_lengths), max(value_lengths)]
+    
+    def _data_lengths(self):
+        """Return the longest header or value length of each data column"""
+        # Single vectorized pass over the data
+        lengths = np.array([len(str(header)) for header in self.cleaned_data.columns])
+        if len(self.cleaned_data):
+            text = self.cleaned_data.astype(str)
+            # astype(str) drops midnight times, but the writers show the full date and time
+            for col in self.cleaned_data.select_dtypes(include='datetime').columns:
+                text[col] = self.cleaned_data[col].dt.strftime('%Y-%m-%d %H:%M:%S')
+            value_lengths = text.apply(lambda s: s.str.len().max()).to_numpy()
+            lengths = np.maximum(value_lengths, lengths)
+        return lengths
+    
+    def _data_rows(self):
+        """Yield the data rows as tuples with missing values replaced by None (blank cells)"""
+        missing_cols = np.flatnonzero(self.cleaned_data.isna().any().to_numpy())
+        for row_data in self.cleaned_data.itertuples(index=False, name=None):
+            if len(missing_cols):
+                row_data = list(row_data)
+                for col_idx in missing_cols:
+                    if pd.isna(row_data[col_idx]):
+                        row_data[col_idx] = None
+            yield row_data
+    
+    def _top_products(self):
+        """Return revenue per product for the ten best-selling products"""
+        return self.cleaned_data.groupby('Product', observed=True)['Revenue'].sum().sort_values(ascending=False).head(10)
+    
     def _create_summary_sheet(self, sheet):
         """Create the summary sheet with key metrics"""
+        rows = self._summary_rows()
+        generated_at = datetime.now().strftime("%Y-%m-%d %H:%M")
+        
+        # Column widths must be set before the first row is written
+        self._set_column_widths(sheet, self._summary_lengths(rows, generated_at), 50)
+        
         # Title
-        sheet['A1'] = "Weekly Report Summary"
-        sheet['A1'].font = Font(size=16, bold=True)
-        sheet.merge_cells('A1:D1')
+        sheet.append([self._styled_cell(sheet, SUMMARY_TITLE, font=TITLE_FONT)])
+        sheet.merged_cells.add('A1:D1')
+        sheet.append([])
         
         # Date
-        sheet['A3'] = "Report Generated:"
-        sheet['B3'] = datetime.now().strftime("%Y-%m-%d %H:%M")
+        sheet.append([GENERATED_LABEL, generated_at])
+        sheet.append([])
         
         # Summary statistics
-        summary = self.generate_summary_stats()
-        row = 5
-        
-        for key, value in summary.items():
-            sheet[f'A{row}'] = key.replace('_', ' ').title()
-            sheet[f'B{row}'] = value
-            if isinstance(value, (int, float)) and 'Revenue' in key:
-                sheet[f'B{row}'].number_format = '$#,##0.00'
-            row += 1
-        
-        # Format headers
-        for row in range(5, row):
-            sheet[f'A{row}'].font = Font(bold=True)
-            sheet[f'A{row}'].fill = PatternFill(start_color="E6E6FA", end_color="E6E6FA", fill_type="solid")
-        
-        # Auto-adjust column widths
-        for column in sheet.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            sheet.column_dimensions[column_letter].width = adjusted_width
+        for label, value, fmt in rows:
+            label_cell = self._styled_cell(sheet, label, font=BOLD_FONT, fill=SUMMARY_FILL)
+            if fmt is not None:
+                value = self._styled_cell(sheet, value, number_format=fmt)
+            sheet.append([label_cell, value])
     
     def _create_data_sheet(self, sheet):
         """Create the raw data sheet"""
-        # Add headers
         headers = list(self.cleaned_data.columns)
-        for col_idx, header in enumerate(headers, 1):
-            cell = sheet.cell(row=1, column=col_idx, value=header)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-            cell.font = Font(color="FFFFFF", bold=True)
+        # Number formats are decided once per column, not per cell
+        col_formats = [
+            (col_idx, fmt)
+            for col_idx, fmt in enumerate(self._column_formats(headers))
+            if fmt is not None
+        ]
+        
+        self._set_column_widths(sheet, self._data_lengths(), 30)
+        
+        # Add headers
+        sheet.append([
+            self._styled_cell(sheet, header, font=BOLD_WHITE, fill=HEADER_FILL)
+            for header in headers
+        ])
         
         # Add data
-        for row_idx, row_data in enumerate(dataframe_to_rows(self.cleaned_data, index=False, header=False), 2):
-            for col_idx, value in enumerate(row_data, 1):
-                cell = sheet.cell(row=row_idx, column=col_idx, value=value)
-                
-                # Format numbers
-                if col_idx in [i+1 for i, col in enumerate(headers) if col in self.config['numeric_columns']]:
-                    if 'Revenue' in headers[col_idx-1]:
-                        cell.number_format = '$#,##0.00'
-                    else:
-                        cell.number_format = '#,##0'
-        
-        # Auto-adjust column widths
-        for column in sheet.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 30)
-            sheet.column_dimensions[column_letter].width = adjusted_width
+        for row_data in self._data_rows():
+            if col_formats:
+                row_data = list(row_data)
+                for col_idx, fmt in col_formats:
+                    row_data[col_idx] = self._styled_cell(sheet, row_data[col_idx], number_format=fmt)
+            sheet.append(row_data)
     
     def _create_charts_sheet(self, sheet):
         """Create charts and visualizations"""
-        sheet['A1'] = "Data Visualizations"
-        sheet['A1'].font = Font(size=14, bold=True)
+        sheet.append([self._styled_cell(sheet, "Data Visualizations", font=CHART_TITLE_FONT)])
         
         # Create product revenue chart if applicable
         if 'Product' in self.cleaned_data.columns and 'Revenue' in self.cleaned_data.columns:
-            product_data = self.cleaned_data.groupby('Product')['Revenue'].sum().sort_values(ascending=False).head(10)
+            product_data = self._top_products()
             
-            # Add chart data
-            row = 3
-            sheet[f'A{row}'] = "Product"
-            sheet[f'B{row}'] = "Revenue"
+            # Chart data fills A:B from the header on row 3 down to last_row
+            header_row = 3
+            last_row = header_row + len(product_data)
+            data_ref = Reference(sheet, min_col=2, min_row=header_row, max_col=2, max_row=last_row)
+            cats_ref = Reference(sheet, min_col=1, min_row=header_row + 1, max_row=last_row)
             
-            for idx, (product, revenue) in enumerate(product_data.items(), row + 1):
-                sheet[f'A{idx}'] = product
-                sheet[f'B{idx}'] = revenue
+            # Add chart data
+            sheet.append([])
+            sheet.append(["Product", "Revenue"])
+            for row_data in product_data.reset_index().itertuples(index=False, name=None):
+                sheet.append(row_data)
             
             # Create chart
             chart = BarChart()
@@ -299,9 +631,6 @@ class WeeklyReportGenerator:
             chart.x_axis.title = "Products"
             chart.y_axis.title = "Revenue"
             
-            data_ref = Reference(sheet, min_col=2, min_row=row, max_col=2, max_row=row + len(product_data))
-            cats_ref = Reference(sheet, min_col=1, min_row=row + 1, max_row=row + len(product_data))
-            
             chart.add_data(data_ref, titles_from_data=True)
             chart.set_categories(cats_ref)
             
@@ -347,39 +676,36 @@ def main():
         logging.error(f"Unexpected error in main: {e}")
         print(f"❌ Unexpected error: {e}")
 
-def create_sample_data():
-    """Create sample data for demonstration"""
-    import random
-    from datetime import datetime, timedelta
+def create_sample_data(seed=None):
+    """Create sample data for demonstration (pass a seed for reproducible data)"""
+    rng = np.random.default_rng(seed)
     
     # Generate sample data
     products = ['Product A', 'Product B', 'Product C', 'Product D', 'Product E']
     regions = ['North', 'South', 'East', 'West', 'Central']
     
-    data = []
-    start_date = datetime.now() - timedelta(days=30)
+    n = 200
+    start_date = np.datetime64(datetime.now().date() - timedelta(days=30))
     
-    for i in range(200):
-        date = start_date + timedelta(days=random.randint(0, 30))
-        product = random.choice(products)
-        region = random.choice(regions)
-        units = random.randint(1, 100)
-        price = random.uniform(10, 500)
-        revenue = units * price
-        sales = random.randint(1, 20)
-        
-        data.append({
-            'Date': date.strftime('%Y-%m-%d'),
-            'Product': product,
-            'Sales': sales,
-            'Units': units,
-            'Revenue': round(revenue, 2),
-            'Region': region
-        })
+    # Generate each column as a whole array
+    day_offsets = rng.integers(0, 31, n)
+    product_idx = rng.integers(0, len(products), n)
+    region_idx = rng.integers(0, len(regions), n)
+    units = rng.integers(1, 101, n)
+    price = rng.uniform(10, 500, n)
+    sales = rng.integers(1, 21, n)
+    
+    df = pd.DataFrame({
+        'Date': start_date + day_offsets,
+        'Product': pd.Categorical.from_codes(product_idx, products),
+        'Sales': sales,
+        'Units': units,
+        'Revenue': np.round(units * price, 2),
+        'Region': pd.Categorical.from_codes(region_idx, regions),
+    })
     
     # Save sample data
-    df = pd.DataFrame(data)
-    df.to_csv('raw_data.csv', index=False)
+    df.to_csv('raw_data.csv', index=False, date_format='%Y-%m-%d')
     logging.info("Sample data created: raw_data.csv")
 
 if __name__ == "__main__":